@@ -4,30 +4,13 @@ parse input data and output pyrv instruction objects
 """
 
 import logging
-import re
 
 import elftools.elf.descriptions as elf_desc
 from elftools.elf.elffile import ELFFile
 
 from pyrv.helpers import InvalidInstructionError, UnsupportedExecutableError
-from pyrv.instructions import (
-    BTYPE_OPS,
-    ITYPE_OPS,
-    JTYPE_OPS,
-    OP2INSTR,
-    RTYPE_OPS,
-    STYPE_OPS,
-    UTYPE_OPS,
-    BType,
-    Instruction,
-    IType,
-    JType,
-    RType,
-    SType,
-    UType,
-)
+from pyrv.instructions import OP_DISPATCH, Instruction
 
-OP_RE = re.compile(r"^\s*(\w+)(.*)$")
 logger = logging.getLogger(__name__)
 
 
@@ -39,39 +22,42 @@ def asm2instr(asm: tuple) -> Instruction:
     assembly files is not guaranteed.
     """
     op, args = asm
+    try:
+        frame_type, instr_type = OP_DISPATCH[op]
+    except KeyError:
+        raise InvalidInstructionError from None
 
-    if op in ITYPE_OPS:
-        frame = IType(rd=args[0], rs1=args[1], imm=args[2])
-    elif op in RTYPE_OPS:
-        frame = RType(rd=args[0], rs1=args[1], rs2=args[2])
-    elif op in BTYPE_OPS:
-        frame = BType(rs1=args[0], rs2=args[1], imm=args[2])
-    elif op in JTYPE_OPS:
-        frame = JType(rd=args[0], imm=args[1])
-    elif op in STYPE_OPS:
-        frame = SType(rs1=args[0], rs2=args[1], imm=args[2])
-    elif op in UTYPE_OPS:
-        frame = UType(rd=args[0], imm=args[1])
-    else:
-        raise InvalidInstructionError
+    # frame fields are declared in the same order as the assembly arguments
+    fields = frame_type.__annotations__
+    if len(args) != len(fields):
+        raise InvalidInstructionError(
+            f"{op} takes {len(fields)} operands, got {len(args)}"
+        )
+    return instr_type(frame_type(zip(fields, args, strict=True)))
 
-    return OP2INSTR[op](frame)
 
-
-def parse_asm(line: str) -> tuple | None:
+def parse_asm(text: str) -> list[tuple[str, list[str]]]:
     """
-    Parse an assembly file for instructions, returning the operation and any arguments.
+    Parse the text of an assembly file for instructions, returning the operation and
+    any arguments of each instruction found.
 
     This is valid for debug only, there is no advanced calculation of label offsets, no
-    notion of linker relaxations, and so on.
+    notion of linker relaxations, and so on. Labels and directives are skipped.
     """
-    if m := OP_RE.match(line):
-        op = m.group(1)
-        args = m.group(2)
-        if (i := args.find("#")) > -1:  # strip comments
-            args = args[:i]
-        args = [a.strip() for a in args.split(",")]
-        return (op, args)
+    instrs = []
+    for line in text.splitlines():
+        code = line.partition("#")[0]  # strip comments
+        # strip leading labels, keeping any instruction on the same line
+        label, sep, rest = code.partition(":")
+        while sep and (label.strip().isidentifier() or label.strip().isdigit()):
+            code = rest
+            label, sep, rest = code.partition(":")
+        fields = code.split(None, 1)
+        if not fields or not fields[0].isidentifier():
+            continue
+        args = [a.strip() for a in fields[1].split(",")] if len(fields) > 1 else []
+        instrs.append((fields[0], args))
+    return instrs
 
 
 def check_elf(elf_file: ELFFile):
@@ -5,14 +5,15 @@ from pyrv.harts import Hart
 from tests.helpers import compile_sourcefile
 
 
+def print_in_box(text: str):
+    print(f"+{'-' * (len(text) + 2)}+")
+    print(f"| {text} |")
+    print(f"+{'-' * (len(text) + 2)}+")
+
+
 def main() -> int:
     logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 
-    def print_in_box(text: str):
-        print(f"+{'-' * (len(text) + 2)}+")
-        print(f"| {text} |")
-        print(f"+{'-' * (len(text) + 2)}+")
-
     print_in_box("pyrv: RISC-V instruction set simulator")
     elf = compile_sourcefile(Path("."), "simexit.S")
     hart = Hart()
@@ -1,12 +1,17 @@
 import logging
+import sys
+from collections.abc import Callable
+from contextlib import suppress
 from pathlib import Path
 
+import numpy
 from elftools.elf.constants import P_FLAGS
 from elftools.elf.elffile import ELFFile
 
 from pyrv.adapters import check_elf
-from pyrv.helpers import MutableRegister
+from pyrv.helpers import InvalidInstructionError, MutableRegister, Register
 from pyrv.instructions import decode_instr
+from pyrv.jit import JIT_AVAILABLE, step_n
 from pyrv.models import (
     DataMemory,
     InstructionMemory,
@@ -16,20 +21,63 @@ from pyrv.models import (
 )
 
 
+class ProgramCounter(MutableRegister):
+    """
+    A register view of a hart's pc for external introspection. The hart keeps the pc
+    as a plain int in `_pc` so instructions can advance it without method calls.
+    """
+
+    def __init__(self, hart: "Hart") -> None:
+        self._hart = hart
+
+    def read(self) -> int:
+        return self._hart._pc
+
+    def write(self, value: int) -> None:
+        self._hart._pc = self._masked(value)
+
+
 class Hart:
     """
     A hart containing the minimum necessary components for code execution.
     """
 
+    # hot fields first: the pc and register file are touched by every instruction
+    __slots__ = (
+        "_pc",
+        "register_file",
+        "rf",
+        "system_bus",
+        "instruction_memory",
+        "data_memory",
+        "sim_control",
+        "halted",
+        "jit",
+        "_decode_cache",
+        "_jit_regs",
+        "_jit_code",
+        "_jit_data",
+        "_log",
+    )
+
     INSTRUCTION_MEMORY_BASE = 0x0
     INSTRUCTION_MEMORY_SIZE = 2 * 1024 * 1024
     DATA_MEMORY_BASE = INSTRUCTION_MEMORY_BASE + INSTRUCTION_MEMORY_SIZE
     DATA_MEMORY_SIZE = 6 * 1024 * 1024
-    SIM_CONTROL_BASE = 0xFFFFFFEF
+    SIM_CONTROL_BASE = 0xFFFFFFF0
     SIM_CONTROL_SIZE = 0x10
+    ELF_READ_BUFFER_SIZE = 1024 * 1024
+    JIT_BATCH_SIZE = 64 * 1024
 
-    def __init__(self):
-        self.pc: MutableRegister = MutableRegister()
+    def __init__(self, jit: bool = True):
+        """
+        Args:
+            jit: run code through the native kernel in `pyrv.jit` when Numba is
+            installed and the host is little-endian, pass False to always use the
+            pure Python interpreter
+        """
+        self._pc: int = 0
+        """The program counter, read and written directly by instructions"""
         self.register_file: RegisterFile = RegisterFile()
         self.rf = self.register_file  # alias
 
@@ -60,19 +108,155 @@ class Hart:
             self.sim_control,
         )
 
+        self.halted = False
+        """Set when software requests an exit through the `SimControl` block"""
+        self.sim_control.add_trigger(0x0, lambda new, old: new & 0x1, self._halt)
+
+        self._decode_cache: dict[int, Callable[[Hart], None]] = {}
+        """
+        Bound `exec` methods keyed by instruction word. Decoding depends only on the
+        word, so repeated words (e.g. in unrolled code or after a store to instruction
+        memory) share a single decode.
+        """
+
+        # the kernel views memories as little-endian words, as `Memory` does only on
+        # little-endian hosts
+        self.jit = jit and JIT_AVAILABLE and sys.byteorder == "little"
+        # zero-copy views of the register file and memories for the jit kernel
+        self._jit_regs = numpy.frombuffer(self.register_file._items, numpy.uint32)
+        self._jit_code = numpy.frombuffer(
+            self.instruction_memory._contents, numpy.uint32
+        )
+        self._jit_data = numpy.frombuffer(self.data_memory._contents, numpy.uint8)
+
         self._log = logging.getLogger(__name__)
 
+    @property
+    def pc(self) -> ProgramCounter:
+        return ProgramCounter(self)
+
+    @pc.setter
+    def pc(self, value: int | Register) -> None:
+        i_val = value if isinstance(value, int) else value.read()
+        self._pc = i_val & Register.MASK
+
+    def _halt(self, new: int, old: int):
+        self.halted = True
+
     def step(self):
         """Step the simulator forward by one iteration"""
-        assert self.system_bus is not None
-        # fetch
-        instr_word = self.read(self.pc.read(), 4)
-        self._log.debug(f"Fetching instruction: {self.pc=}")
-        # decode
-        instr = decode_instr(instr_word)
-        self._log.debug(f"Decoded instruction: {instr=}")
+        pc = self._pc
+        decoded = self.instruction_memory.decoded
+        idx = (pc - self.INSTRUCTION_MEMORY_BASE) >> 2
+        cacheable = not pc & 0x3 and 0 <= idx < len(decoded)
+        handler = decoded[idx] if cacheable else None
+        if handler is None:
+            # fetch, reading instruction memory directly unless pc lies outside it
+            if cacheable:
+                instr_word = self.instruction_memory.read_word(idx << 2)
+            else:
+                instr_word = self.read(pc, 4)
+            self._log.debug("Fetching instruction: pc=%#x", pc)
+            # decode
+            handler = self._decode(instr_word)
+            if cacheable:
+                decoded[idx] = handler
         # execute
-        instr.exec(self)
+        handler(self)
+
+    def run(self, max_steps: int | None = None) -> int:
+        """
+        Run the instruction loop until software requests an exit, or until
+        `max_steps` instructions have been executed.
+
+        Returns the number of instructions executed.
+        """
+        steps = 0
+        blocks = self.instruction_memory.blocks
+        while not self.halted and (max_steps is None or steps < max_steps):
+            if self.jit:
+                budget = self.JIT_BATCH_SIZE
+                if max_steps is not None:
+                    budget = min(budget, max_steps - steps)
+                pc, n = step_n(
+                    self._jit_regs,
+                    self._jit_code,
+                    self.INSTRUCTION_MEMORY_BASE,
+                    self._jit_data,
+                    self.DATA_MEMORY_BASE,
+                    self._pc,
+                    budget,
+                )
+                self._pc = int(pc)
+                steps += n
+                if n == budget:
+                    continue
+            else:
+                block = blocks.get(self._pc)
+                if block is None:
+                    block = self._build_block(self._pc)
+                if block and (max_steps is None or steps + len(block) <= max_steps):
+                    for handler in block:
+                        handler(self)
+                    steps += len(block)
+                    continue
+            # the kernel stopped at an instruction it cannot handle, or no whole block
+            # can run from this pc
+            self.step()
+            steps += 1
+        return steps
+
+    def _build_block(self, pc: int) -> list[Callable[["Hart"], None]]:
+        """
+        Decode the block of straight-line code starting at `pc`, ending with the
+        first instruction that may change control flow or memory. The block is cached
+        in instruction memory until it is next written to.
+
+        The block stops short of any word that is not a valid instruction, and is
+        empty if `pc` lies outside instruction memory.
+        """
+        decoded = self.instruction_memory.decoded
+        idx = (pc - self.INSTRUCTION_MEMORY_BASE) >> 2
+        if pc & 0x3 or not 0 <= idx < len(decoded):
+            return []
+
+        block = self.instruction_memory.blocks[pc] = []
+        while idx < len(decoded):
+            handler = decoded[idx]
+            if handler is None:
+                try:
+                    handler = self._decode(self.instruction_memory.read_word(idx << 2))
+                except InvalidInstructionError:
+                    break
+                decoded[idx] = handler
+            block.append(handler)
+            if handler.__self__.ENDS_BLOCK:
+                break
+            idx += 1
+        return block
+
+    def _decode(self, word: int) -> Callable[["Hart"], None]:
+        """Return the `exec` method of the instruction encoded by `word`"""
+        handler = self._decode_cache.get(word)
+        if handler is None:
+            instr = decode_instr(word)
+            self._log.debug("Decoded instruction: instr=%r", instr)
+            handler = self._decode_cache[word] = instr.exec
+        return handler
+
+    def predecode(self, addr: int, n_bytes: int):
+        """
+        Decode the instructions in `n_bytes` of instruction memory starting at offset
+        `addr`, ahead of their execution.
+
+        Words that do not decode to a valid instruction (e.g. literal pools) are
+        skipped and will raise if they are ever executed.
+        """
+        decoded = self.instruction_memory.decoded
+        for idx in range(addr >> 2, min((addr + n_bytes) >> 2, len(decoded))):
+            word = self.instruction_memory.read_word(idx << 2)
+            with suppress(InvalidInstructionError):
+                decoded[idx] = self._decode(word)
 
     def load(self, elf_path: Path | str):
         """
@@ -86,14 +270,17 @@ class Hart:
         if not elf_path.is_file():
             raise FileNotFoundError
 
-        with open(elf_path, "rb") as f:
+        # a large buffer turns elftools' many small header/segment reads into
+        # a handful of read syscalls
+        with open(elf_path, "rb", buffering=self.ELF_READ_BUFFER_SIZE) as f:
             elf_file = ELFFile(f)
             check_elf(elf_file)
             for seg in elf_file.iter_segments("PT_LOAD"):
                 if seg["p_flags"] & P_FLAGS.PF_X:
-                    self.instruction_memory._write_bytes(0, seg.data())
+                    self.instruction_memory.write_block(0, seg.data())
+                    self.predecode(0, seg["p_filesz"])
                 else:
-                    self.data_memory._write_bytes(0, seg.data())
+                    self.data_memory.write_block(0, seg.data())
 
     def read(self, addr: int, n_bytes: int) -> int:
         return self.system_bus.read(addr, n_bytes)
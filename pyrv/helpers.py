@@ -17,27 +17,27 @@ class Register:
 
     def _int_or_reg(self, value: Self | int) -> int:
         o_val = value if isinstance(value, int) else value.read()
-        return self._masked(o_val)
+        return o_val & self.MASK
 
     def read(self) -> int:
         return self._value
 
     def write(self, value: int) -> None:
-        # RISC-V allows writes so long as they don't take effect
-        value = value  # do something silly like this so PyRight is happy
+        """RISC-V allows writes to read-only registers so long as they don't take
+        effect, so this is a no-op"""
 
     # use a decorator here?
     def __add__(self, other: Self | int) -> int:
-        return self._masked(self.read() + self._int_or_reg(other))
+        return (self.read() + self._int_or_reg(other)) & self.MASK
 
     def __sub__(self, other: Self | int) -> int:
-        return self._masked(self.read() - self._int_or_reg(other))
+        return (self.read() - self._int_or_reg(other)) & self.MASK
 
     def __lshift__(self, other: Self | int) -> int:
-        return self._masked(self.read() << self._int_or_reg(other))
+        return (self.read() << self._int_or_reg(other)) & self.MASK
 
     def __rshift__(self, other: Self | int) -> int:
-        return self._masked(self.read() >> self._int_or_reg(other))
+        return (self.read() >> self._int_or_reg(other)) & self.MASK
 
     def __xor__(self, other: Self | int) -> int:
         return self.read() ^ self._int_or_reg(other)
@@ -79,11 +79,9 @@ class MutableRegister(Register):
     def __init__(self, value: int = 0) -> None:
         super().__init__(value)
 
-    def _masked(self, value: int) -> int:
-        return value & self.MASK
-
     def write(self, value: int) -> None:
-        self._value = self._masked(value)
+        # coerce numpy scalars so arithmetic on the register stays on Python ints
+        self._value = self._masked(int(value))
 
 
 def se(value: int, bits: int = 32) -> int:
@@ -96,6 +94,24 @@ def se(value: int, bits: int = 32) -> int:
     return (value ^ sign_bit) - sign_bit
 
 
+# `se` specialised for the immediate widths in RV32I encodings, with constant sign bits
+
+
+def se12(value: int) -> int:
+    """Sign extend a 12-bit (I-type and S-type) immediate"""
+    return (value ^ 0x800) - 0x800
+
+
+def se13(value: int) -> int:
+    """Sign extend a 13-bit (B-type) immediate"""
+    return (value ^ 0x1000) - 0x1000
+
+
+def se21(value: int) -> int:
+    """Sign extend a 21-bit (J-type) immediate"""
+    return (value ^ 0x10_0000) - 0x10_0000
+
+
 def bselect(bits: int, msb: int, lsb: int, shift: int = 0) -> int:
     """
     Return the int obtained by slicing `bits` from `msb` to `lsb`, optionally
@@ -7,7 +7,7 @@ from abc import ABC, abstractmethod
 from collections.abc import Mapping
 from typing import TYPE_CHECKING, TypedDict, TypeVar, get_args
 
-from pyrv.helpers import InvalidInstructionError, bselect, se
+from pyrv.helpers import InvalidInstructionError, se12, se13, se21
 from pyrv.models import RegisterFile
 
 if TYPE_CHECKING:
@@ -51,38 +51,47 @@ class JType(TypedDict):
 T = TypeVar("T", IType, RType, SType, BType, UType, JType)
 
 
+def reg_index(reg: int | str) -> int:
+    """Resolve a register name (e.g. `a0`, `x10`) or index to a register index"""
+    return RegisterFile.ALIASES[reg] if isinstance(reg, str) else reg
+
+
 class Instruction[T: Mapping](ABC):
-    def __init__(self, frame: T):
-        self._frame = frame
+    __slots__ = ("rd", "rs1", "rs2", "imm")
 
-    @abstractmethod
-    def exec(self, hart: "Hart"):
-        pass
+    ENDS_BLOCK = False
+    """Whether this instruction may change control flow or memory, ending a block of
+    straight-line code"""
 
-    @property
-    def rd(self):
-        return self._frame["rd"]
+    _frame_type: type
 
-    @property
-    def rs1(self):
-        return self._frame["rs1"]
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # resolve the frame type from the Generics data once per class rather than on
+        # every `frame_type` access
+        cls._frame_type = get_args(cls.__orig_bases__[0])[0]  # type: ignore
 
-    @property
-    def rs2(self):
-        return self._frame["rs2"]
+    def __init__(self, frame: T):
+        # unpack the frame once so operand reads in `exec` are plain slot loads,
+        # fields not present in this instruction's frame type are left as 0
+        self.rd = reg_index(frame.get("rd", 0))
+        self.rs1 = reg_index(frame.get("rs1", 0))
+        self.rs2 = reg_index(frame.get("rs2", 0))
+        self.imm = frame.get("imm", 0)
 
-    @property
-    def imm(self):
-        return self._frame["imm"]
+    @abstractmethod
+    def exec(self, hart: "Hart"):
+        """Execute this instruction on `hart`, including advancing its pc"""
+        pass
 
     @property
     def frame_type(self):
         """
-        Extract the type of frame used (`IType`, `RType`, etc) from the Generics
-        data of the parent
+        The type of frame used (`IType`, `RType`, etc), taken from the Generics data
+        of the parent
         """
 
-        return get_args(type(self).__orig_bases__[0])[0]  # type: ignore
+        return self._frame_type
 
     def to_asm(self) -> str:
         instr_frame = self.frame_type
@@ -111,7 +120,9 @@ class Instruction[T: Mapping](ABC):
         return asm
 
     def __eq__(self, other):
-        return self._frame == other._frame and self.frame_type == other.frame_type
+        operands = (self.rd, self.rs1, self.rs2, self.imm)
+        other_operands = (other.rd, other.rs1, other.rs2, other.imm)
+        return self.frame_type == other.frame_type and operands == other_operands
 
     def __repr__(self) -> str:
         return self.to_asm()
@@ -131,9 +142,14 @@ class JumpAndLink(Instruction[JType]):
     jal rd, imm
     """
 
+    __slots__ = ()
+    ENDS_BLOCK = True
+
     def exec(self, hart: "Hart"):
-        hart.rf[self.rd] = hart.pc + 4
-        hart.pc += self.imm
+        rf = hart.rf._items
+        rf[self.rd] = (hart._pc + 4) & 0xFFFF_FFFF
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc = (hart._pc + self.imm) & 0xFFFF_FFFF
 
 
 class JumpAndLinkRegister(Instruction[IType]):
@@ -145,10 +161,15 @@ class JumpAndLinkRegister(Instruction[IType]):
     jalr rd, rs1, imm
     """
 
+    __slots__ = ()
+    ENDS_BLOCK = True
+
     def exec(self, hart: "Hart"):
-        hart.rf[self.rd] = hart.pc + 4
-        val = hart.rf[self.rs1] + self.imm
-        hart.pc.write(val & 0xFFFF_FFFE)
+        rf = hart.rf._items
+        target = rf[self.rs1] + self.imm
+        rf[self.rd] = (hart._pc + 4) & 0xFFFF_FFFF
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc = target & 0xFFFF_FFFE
 
 
 class BranchEqual(Instruction[BType]):
@@ -160,9 +181,15 @@ class BranchEqual(Instruction[BType]):
     beq rs1, rs2, imm
     """
 
+    __slots__ = ()
+    ENDS_BLOCK = True
+
     def exec(self, hart: "Hart"):
-        if hart.rf[self.rs1] == hart.rf[self.rs2]:
-            hart.pc += self.imm
+        rf = hart.rf._items
+        if rf[self.rs1] == rf[self.rs2]:
+            hart._pc = (hart._pc + self.imm) & 0xFFFF_FFFF
+        else:
+            hart._pc += 4
 
 
 class BranchNotEqual(Instruction[BType]):
@@ -175,9 +202,15 @@ class BranchNotEqual(Instruction[BType]):
     bne rs1, rs2, imm
     """
 
+    __slots__ = ()
+    ENDS_BLOCK = True
+
     def exec(self, hart: "Hart"):
-        if hart.rf[self.rs1] != hart.rf[self.rs2]:
-            hart.pc += self.imm
+        rf = hart.rf._items
+        if rf[self.rs1] != rf[self.rs2]:
+            hart._pc = (hart._pc + self.imm) & 0xFFFF_FFFF
+        else:
+            hart._pc += 4
 
 
 class BranchOnLessThan(Instruction[BType]):
@@ -188,11 +221,15 @@ class BranchOnLessThan(Instruction[BType]):
     blt rs1, rs2, imm
     """
 
+    __slots__ = ()
+    ENDS_BLOCK = True
+
     def exec(self, hart: "Hart"):
-        a = se(hart.rf[self.rs1].read())
-        b = se(hart.rf[self.rs2].read())
-        if a < b:
-            hart.pc += self.imm
+        rs = hart.rf._signed
+        if rs[self.rs1] < rs[self.rs2]:
+            hart._pc = (hart._pc + self.imm) & 0xFFFF_FFFF
+        else:
+            hart._pc += 4
 
 
 class BranchOnLessThanU(Instruction[BType]):
@@ -203,9 +240,15 @@ class BranchOnLessThanU(Instruction[BType]):
     bltu rs1, rs2, imm
     """
 
+    __slots__ = ()
+    ENDS_BLOCK = True
+
     def exec(self, hart: "Hart"):
-        if hart.rf[self.rs1] < hart.rf[self.rs2]:
-            hart.pc += self.imm & 0xFFFF_FFFF
+        rf = hart.rf._items
+        if rf[self.rs1] < rf[self.rs2]:
+            hart._pc = (hart._pc + self.imm) & 0xFFFF_FFFF
+        else:
+            hart._pc += 4
 
 
 class BranchOnGreaterThanEqual(Instruction[BType]):
@@ -216,11 +259,15 @@ class BranchOnGreaterThanEqual(Instruction[BType]):
     bge rs1, rs2, imm
     """
 
+    __slots__ = ()
+    ENDS_BLOCK = True
+
     def exec(self, hart: "Hart"):
-        a = se(hart.rf[self.rs1].read())
-        b = se(hart.rf[self.rs2].read())
-        if a >= b:
-            hart.pc += self.imm
+        rs = hart.rf._signed
+        if rs[self.rs1] >= rs[self.rs2]:
+            hart._pc = (hart._pc + self.imm) & 0xFFFF_FFFF
+        else:
+            hart._pc += 4
 
 
 class BranchOnGreaterThanEqualU(Instruction[BType]):
@@ -231,9 +278,15 @@ class BranchOnGreaterThanEqualU(Instruction[BType]):
     bgeu rs1, rs2, imm
     """
 
+    __slots__ = ()
+    ENDS_BLOCK = True
+
     def exec(self, hart: "Hart"):
-        if hart.rf[self.rs1] >= hart.rf[self.rs2]:
-            hart.pc += self.imm & 0xFFFF_FFFF
+        rf = hart.rf._items
+        if rf[self.rs1] >= rf[self.rs2]:
+            hart._pc = (hart._pc + self.imm) & 0xFFFF_FFFF
+        else:
+            hart._pc += 4
 
 
 # --- Load/Store instructions ---
@@ -247,9 +300,14 @@ class LoadWord(Instruction[IType]):
     lw rd, imm(rs1)
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart"):
-        assert hart.system_bus is not None
-        hart.rf[self.rd] = hart.system_bus.read(self.rs1 + self.imm, 4)
+        rf = hart.rf._items
+        addr = (rf[self.rs1] + self.imm) & 0xFFFF_FFFF
+        rf[self.rd] = hart.system_bus.read(addr, 4)
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class LoadHalfwordU(Instruction[IType]):
@@ -260,9 +318,14 @@ class LoadHalfwordU(Instruction[IType]):
     lhu rd, imm(rs1)
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart"):
-        assert hart.system_bus is not None
-        hart.rf[self.rd] = hart.system_bus.read(self.rs1 + self.imm, 2)
+        rf = hart.rf._items
+        addr = (rf[self.rs1] + self.imm) & 0xFFFF_FFFF
+        rf[self.rd] = hart.system_bus.read(addr, 2)
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class LoadByteU(Instruction[IType]):
@@ -273,9 +336,14 @@ class LoadByteU(Instruction[IType]):
     lbu rd, imm(rs1)
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart"):
-        assert hart.system_bus is not None
-        hart.rf[self.rd] = hart.system_bus.read(self.rs1 + self.imm, 1)
+        rf = hart.rf._items
+        addr = (rf[self.rs1] + self.imm) & 0xFFFF_FFFF
+        rf[self.rd] = hart.system_bus.read(addr, 1)
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class LoadHalfword(Instruction[IType]):
@@ -286,9 +354,15 @@ class LoadHalfword(Instruction[IType]):
     lh rd, imm(rs1)
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart"):
-        assert hart.system_bus is not None
-        hart.rf[self.rd] = se(hart.system_bus.read(self.rs1 + self.imm, 2), 16)
+        rf = hart.rf._items
+        addr = (rf[self.rs1] + self.imm) & 0xFFFF_FFFF
+        data = hart.system_bus.read(addr, 2)
+        rf[self.rd] = ((data ^ 0x8000) - 0x8000) & 0xFFFF_FFFF  # sign extend
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class LoadByte(Instruction[IType]):
@@ -299,9 +373,15 @@ class LoadByte(Instruction[IType]):
     lb rd, imm(rs1)
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart"):
-        assert hart.system_bus is not None
-        hart.rf[self.rd] = se(hart.system_bus.read(self.rs1 + self.imm, 1), 8)
+        rf = hart.rf._items
+        addr = (rf[self.rs1] + self.imm) & 0xFFFF_FFFF
+        data = hart.system_bus.read(addr, 1)
+        rf[self.rd] = ((data ^ 0x80) - 0x80) & 0xFFFF_FFFF  # sign extend
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class StoreWord(Instruction[SType]):
@@ -312,10 +392,14 @@ class StoreWord(Instruction[SType]):
     sw rs2, imm(rs1)
     """
 
+    __slots__ = ()
+    ENDS_BLOCK = True
+
     def exec(self, hart: "Hart"):
-        assert hart.system_bus is not None
-        addr = self.rs1 + self.imm
-        hart.system_bus.write(addr, self.rs2, 4)
+        rf = hart.rf._items
+        addr = (rf[self.rs1] + self.imm) & 0xFFFF_FFFF
+        hart.system_bus.write(addr, rf[self.rs2], 4)
+        hart._pc += 4
 
 
 class StoreHalfword(Instruction[SType]):
@@ -326,10 +410,14 @@ class StoreHalfword(Instruction[SType]):
     sh rs2, imm(rs1)
     """
 
+    __slots__ = ()
+    ENDS_BLOCK = True
+
     def exec(self, hart: "Hart"):
-        assert hart.system_bus is not None
-        addr = self.rs1 + self.imm
-        hart.system_bus.write(addr, self.rs2, 2)
+        rf = hart.rf._items
+        addr = (rf[self.rs1] + self.imm) & 0xFFFF_FFFF
+        hart.system_bus.write(addr, rf[self.rs2], 2)
+        hart._pc += 4
 
 
 class StoreByte(Instruction[SType]):
@@ -340,10 +428,14 @@ class StoreByte(Instruction[SType]):
     sb rs2, imm(rs1)
     """
 
+    __slots__ = ()
+    ENDS_BLOCK = True
+
     def exec(self, hart: "Hart"):
-        assert hart.system_bus is not None
-        addr = self.rs1 + self.imm
-        hart.system_bus.write(addr, self.rs2, 1)
+        rf = hart.rf._items
+        addr = (rf[self.rs1] + self.imm) & 0xFFFF_FFFF
+        hart.system_bus.write(addr, rf[self.rs2], 1)
+        hart._pc += 4
 
 
 # --- Integer-Register immediate operations ---
@@ -357,8 +449,13 @@ class AddImmediate(Instruction[IType]):
     addi rd, rs1, imm
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = hart.rf[self.rs1] + self.imm
+        rf = hart.rf._items
+        rf[self.rd] = (rf[self.rs1] + self.imm) & 0xFFFF_FFFF
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class SetOnLessThanImmediate(Instruction[IType]):
@@ -369,8 +466,13 @@ class SetOnLessThanImmediate(Instruction[IType]):
     slti rd, rs1, imm
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = int(se(hart.rf[self.rs1].read()) < self.imm)
+        rs = hart.rf._signed
+        rs[self.rd] = rs[self.rs1] < self.imm  # bools are stored as 0 or 1
+        rs[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class SetOnLessThanImmediateU(Instruction[IType]):
@@ -381,8 +483,13 @@ class SetOnLessThanImmediateU(Instruction[IType]):
     sltiu rd, rs1, imm
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = int(hart.rf[self.rs1] < (self.imm & 0xFFFF_FFFF))
+        rf = hart.rf._items
+        rf[self.rd] = rf[self.rs1] < (self.imm & 0xFFFF_FFFF)
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class ExclusiveOrImmediate(Instruction[IType]):
@@ -393,8 +500,13 @@ class ExclusiveOrImmediate(Instruction[IType]):
     xori rd, rs1, imm
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = hart.rf[self.rs1] ^ self.imm
+        rf = hart.rf._items
+        rf[self.rd] = (rf[self.rs1] ^ self.imm) & 0xFFFF_FFFF
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class OrImmediate(Instruction[IType]):
@@ -405,8 +517,13 @@ class OrImmediate(Instruction[IType]):
     ori rd, rs1, imm
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = hart.rf[self.rs1] | self.imm
+        rf = hart.rf._items
+        rf[self.rd] = (rf[self.rs1] | self.imm) & 0xFFFF_FFFF
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class AndImmediate(Instruction[IType]):
@@ -417,8 +534,13 @@ class AndImmediate(Instruction[IType]):
     addi rd, rs1, imm
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = hart.rf[self.rs1] & self.imm
+        rf = hart.rf._items
+        rf[self.rd] = rf[self.rs1] & self.imm
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class ShiftLeftLogicalImmediate(Instruction[IType]):
@@ -429,8 +551,13 @@ class ShiftLeftLogicalImmediate(Instruction[IType]):
     slli rd, rs1, imm
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = hart.rf[self.rs1] << self.imm
+        rf = hart.rf._items
+        rf[self.rd] = (rf[self.rs1] << self.imm) & 0xFFFF_FFFF
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class ShiftRightLogicalImmediate(Instruction[IType]):
@@ -441,8 +568,13 @@ class ShiftRightLogicalImmediate(Instruction[IType]):
     srli rd, rs1, imm
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = hart.rf[self.rs1] >> self.imm
+        rf = hart.rf._items
+        rf[self.rd] = rf[self.rs1] >> self.imm
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class ShiftRightArithmeticImmediate(Instruction[IType]):
@@ -453,8 +585,13 @@ class ShiftRightArithmeticImmediate(Instruction[IType]):
     srai rd, rs1, imm
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = se(hart.rf[self.rs1].read()) >> self.imm
+        rs = hart.rf._signed
+        rs[self.rd] = rs[self.rs1] >> self.imm
+        rs[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class LoadUpperImmediate(Instruction[UType]):
@@ -464,8 +601,13 @@ class LoadUpperImmediate(Instruction[UType]):
     lui rd, imm
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = self.imm
+        rf = hart.rf._items
+        rf[self.rd] = self.imm & 0xFFFF_FFFF
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class AddUpperImmediateToPc(Instruction[UType]):
@@ -476,8 +618,13 @@ class AddUpperImmediateToPc(Instruction[UType]):
     auipc rd, imm
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = hart.pc + self.imm
+        rf = hart.rf._items
+        rf[self.rd] = (hart._pc + self.imm) & 0xFFFF_FFFF
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 # --- Integer Register-Register operations ----
@@ -490,8 +637,13 @@ class Add(Instruction[RType]):
     add rd, rs1, rs2
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = hart.rf[self.rs1] + hart.rf[self.rs2]
+        rf = hart.rf._items
+        rf[self.rd] = (rf[self.rs1] + rf[self.rs2]) & 0xFFFF_FFFF
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class Sub(Instruction[RType]):
@@ -501,8 +653,13 @@ class Sub(Instruction[RType]):
     sub rd, rs1, rs2
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = hart.rf[self.rs1] - hart.rf[self.rs2]
+        rf = hart.rf._items
+        rf[self.rd] = (rf[self.rs1] - rf[self.rs2]) & 0xFFFF_FFFF
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class ShiftLeftLogical(Instruction[RType]):
@@ -513,8 +670,13 @@ class ShiftLeftLogical(Instruction[RType]):
     sll rd, rs1, rs2
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = hart.rf[self.rs1] << hart.rf[self.rs2]
+        rf = hart.rf._items
+        rf[self.rd] = (rf[self.rs1] << (rf[self.rs2] & 0x1F)) & 0xFFFF_FFFF
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class SetOnLessThan(Instruction[RType]):
@@ -525,10 +687,13 @@ class SetOnLessThan(Instruction[RType]):
     slt rd, rs1, rs2
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = int(
-            se(hart.rf[self.rs1].read()) < se(hart.rf[self.rs2].read())
-        )
+        rs = hart.rf._signed
+        rs[self.rd] = rs[self.rs1] < rs[self.rs2]
+        rs[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class SetOnLessThanU(Instruction[RType]):
@@ -539,8 +704,13 @@ class SetOnLessThanU(Instruction[RType]):
     sltu rd, rs1, rs2
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = int(hart.rf[self.rs1] < hart.rf[self.rs2])
+        rf = hart.rf._items
+        rf[self.rd] = rf[self.rs1] < rf[self.rs2]
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class ExclusiveOr(Instruction[RType]):
@@ -551,8 +721,13 @@ class ExclusiveOr(Instruction[RType]):
     xor rd, rs1, rs2
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = hart.rf[self.rs1] ^ hart.rf[self.rs2]
+        rf = hart.rf._items
+        rf[self.rd] = rf[self.rs1] ^ rf[self.rs2]
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class ShiftRightLogical(Instruction[RType]):
@@ -563,8 +738,13 @@ class ShiftRightLogical(Instruction[RType]):
     srl rd, rs1, rs2
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = hart.rf[self.rs1] >> hart.rf[self.rs2]
+        rf = hart.rf._items
+        rf[self.rd] = rf[self.rs1] >> (rf[self.rs2] & 0x1F)
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class ShiftRightArithmetic(Instruction[RType]):
@@ -575,8 +755,13 @@ class ShiftRightArithmetic(Instruction[RType]):
     sra rd, rs1, rs2
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:  # cheeky, width of Python int >>>> 32
-        hart.rf[self.rd] = se(hart.rf[self.rs1].read()) >> hart.rf[self.rs2].read()
+        rs = hart.rf._signed
+        rs[self.rd] = rs[self.rs1] >> (rs[self.rs2] & 0x1F)
+        rs[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class Or(Instruction[RType]):
@@ -587,8 +772,13 @@ class Or(Instruction[RType]):
     or rd, rs1, rs2
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = hart.rf[self.rs1] | hart.rf[self.rs2]
+        rf = hart.rf._items
+        rf[self.rd] = rf[self.rs1] | rf[self.rs2]
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
 
 
 class And(Instruction[RType]):
@@ -599,140 +789,77 @@ class And(Instruction[RType]):
     and rd, rs1, rs2
     """
 
+    __slots__ = ()
+
     def exec(self, hart: "Hart") -> None:
-        hart.rf[self.rd] = hart.rf[self.rs1] & hart.rf[self.rs2]
+        rf = hart.rf._items
+        rf[self.rd] = rf[self.rs1] & rf[self.rs2]
+        rf[0] = 0  # x0 is hardwired to zero
+        hart._pc += 4
+
+
+_NOP = Add(RType(rd="x0", rs1="x0", rs2="x0"))
+"""Shared instruction returned for fence and environment instructions, which are
+executed as nops"""
 
 
 def decode_instr(instr: int) -> Instruction:
-    op = bselect(instr, 6, 0)
-    funct3 = bselect(instr, 14, 12)
-    funct7 = bselect(instr, 31, 25)
-    rd = bselect(instr, 11, 7)
-    rs1 = bselect(instr, 19, 15)
-    rs2 = bselect(instr, 24, 20)
-    match op:
-        case 0b0000011:  # loads
-            imm = bselect(instr, 31, 20)
-            frame = IType(rd=rd, rs1=rs1, imm=se(imm, 12))
-            match funct3:
-                case 0b000:
-                    return LoadByte(frame)
-                case 0b001:
-                    return LoadHalfword(frame)
-                case 0b010:
-                    return LoadWord(frame)
-                case 0b100:
-                    return LoadByteU(frame)
-                case 0b101:
-                    return LoadHalfwordU(frame)
-        case 0b0100011:  # stores:
-            imm = bselect(instr, 31, 25, 5) | bselect(instr, 11, 7)
-            frame = SType(rs1=rs1, rs2=rs2, imm=se(imm, 12))
-            match funct3:
-                case 0b000:
-                    return StoreByte(frame)
-                case 0b001:
-                    return StoreHalfword(frame)
-                case 0b010:
-                    return StoreWord(frame)
-        case 0b0010011:  # immediate arithmetic
-            imm = bselect(instr, 31, 20)
-            frame = IType(rd=rd, rs1=rs1, imm=se(imm, 12))
-            match funct3, funct7:
-                case 0b000, _:
-                    return AddImmediate(frame)
-                case 0b010, _:
-                    return SetOnLessThanImmediate(frame)
-                case 0b011, _:
-                    return SetOnLessThanImmediateU(frame)
-                case 0b100, _:
-                    return ExclusiveOrImmediate(frame)
-                case 0b110, _:
-                    return OrImmediate(frame)
-                case 0b111, _:
-                    return AndImmediate(frame)
-                case 0b001, _:
-                    return ShiftLeftLogicalImmediate(frame)
-                case 0b101, 0b0000000:
-                    frame = IType(rd=rd, rs1=rs1, imm=bselect(instr, 24, 20))
-                    return ShiftRightLogicalImmediate(frame)
-                case 0b101, 0b0100000:
-                    frame = IType(rd=rd, rs1=rs1, imm=bselect(instr, 24, 20))
-                    return ShiftRightArithmeticImmediate(frame)
-        case 0b0110011:  # register arithmetic
-            frame = RType(rd=rd, rs1=rs1, rs2=rs2)
-            match funct3, funct7:
-                case 0b000, 0b0000000:
-                    return Add(frame)
-                case 0b000, 0b0100000:
-                    return Sub(frame)
-                case 0b001, _:
-                    return ShiftLeftLogical(frame)
-                case 0b010, _:
-                    return SetOnLessThan(frame)
-                case 0b011, _:
-                    return SetOnLessThanU(frame)
-                case 0b100, _:
-                    return ExclusiveOr(frame)
-                case 0b101, 0b0000000:
-                    return ShiftRightLogical(frame)
-                case 0b101, 0b0100000:
-                    return ShiftRightArithmetic(frame)
-                case 0b110, _:
-                    return Or(frame)
-                case 0b111, _:
-                    return And(frame)
-        case 0b1100011:  # branches
-            imm = (
-                bselect(instr, 31, 31, 12)
-                | bselect(instr, 7, 7, 11)
-                | bselect(instr, 30, 25, 5)
-                | bselect(instr, 11, 8, 1)
-            )
-            frame = BType(rs1=rs1, rs2=rs2, imm=se(imm, 12 + 1))
-            match funct3:
-                case 0b000:
-                    return BranchEqual(frame)
-                case 0b001:
-                    return BranchNotEqual(frame)
-                case 0b100:
-                    return BranchOnLessThan(frame)
-                case 0b101:
-                    return BranchOnGreaterThanEqual(frame)
-                case 0b110:
-                    return BranchOnLessThanU(frame)
-                case 0b111:
-                    return BranchOnGreaterThanEqualU(frame)
-        case 0b1100111:  # jalr
-            imm = bselect(instr, 31, 20)
-            frame = IType(rd=rd, rs1=rs1, imm=se(imm, 12))
-            return JumpAndLinkRegister(frame)
-        case 0b1101111:  # jal
-            imm = (
-                bselect(instr, 31, 31, 20)
-                | bselect(instr, 19, 12, 12)
-                | bselect(instr, 20, 20, 11)
-                | bselect(instr, 30, 21, 1)
-            )
-            frame = JType(rd=rd, imm=se(imm, 20 + 1))
-            return JumpAndLink(frame)
-        case 0b0110111:  # lui
-            frame = UType(
-                rd=rd,
-                imm=bselect(instr, 31, 12, 12),
-            )
-            return LoadUpperImmediate(frame)
-        case 0b0010111:  # auipc
-            frame = UType(rd=rd, imm=bselect(instr, 31, 12, 12))
-            return AddUpperImmediateToPc(frame)
-        case 0b0001111:  # fence
-            pass
-        case 0b1110011:  # env
-            pass
-        case _:
+    """
+    Decode a 32-bit instruction word with a single lookup in `DECODE_TABLE`, keyed by
+    its opcode, funct3 and funct7 fields
+    """
+    key = (instr & 0x7F) << 10 | (instr >> 5) & 0x380 | instr >> 25
+    entry = DECODE_TABLE.get(key)
+    if entry is None:
+        if instr & 0x7F not in OPCODES:
             raise InvalidInstructionError
+        return _NOP
+    frame_builder, instr_type = entry
+    return instr_type(frame_builder(instr))
+
+
+# --- Frame builders, extracting the fields of each format from an instruction word ---
+
+
+def _i_frame(instr: int) -> IType:
+    return IType(rd=instr >> 7 & 0x1F, rs1=instr >> 15 & 0x1F, imm=se12(instr >> 20))
+
 
-    return Add(RType(rd="x0", rs1="x0", rs2="x0"))  # nop
+def _shamt_frame(instr: int) -> IType:
+    return IType(rd=instr >> 7 & 0x1F, rs1=instr >> 15 & 0x1F, imm=instr >> 20 & 0x1F)
+
+
+def _r_frame(instr: int) -> RType:
+    return RType(rd=instr >> 7 & 0x1F, rs1=instr >> 15 & 0x1F, rs2=instr >> 20 & 0x1F)
+
+
+def _s_frame(instr: int) -> SType:
+    imm = (instr >> 25) << 5 | instr >> 7 & 0x1F
+    return SType(rs1=instr >> 15 & 0x1F, rs2=instr >> 20 & 0x1F, imm=se12(imm))
+
+
+def _b_frame(instr: int) -> BType:
+    imm = (
+        (instr >> 31 & 0x1) << 12
+        | (instr >> 7 & 0x1) << 11
+        | (instr >> 25 & 0x3F) << 5
+        | (instr >> 8 & 0xF) << 1
+    )
+    return BType(rs1=instr >> 15 & 0x1F, rs2=instr >> 20 & 0x1F, imm=se13(imm))
+
+
+def _u_frame(instr: int) -> UType:
+    return UType(rd=instr >> 7 & 0x1F, imm=instr & 0xFFFF_F000)
+
+
+def _j_frame(instr: int) -> JType:
+    imm = (
+        (instr >> 31 & 0x1) << 20
+        | (instr >> 12 & 0xFF) << 12
+        | (instr >> 20 & 0x1) << 11
+        | (instr >> 21 & 0x3FF) << 1
+    )
+    return JType(rd=instr >> 7 & 0x1F, imm=se21(imm))
 
 
 OP2INSTR = {
@@ -810,3 +937,89 @@ UTYPE_OPS = ("lui", "auipc")
 JTYPE_OPS = ("jal",)
 STYPE_OPS = ("sw", "sh", "sb")
 BTYPE_OPS = ("beq", "bne", "blt", "bltu", "bge", "bgeu")
+
+OP_DISPATCH = {
+    op: (frame_type, OP2INSTR[op])
+    for frame_type, ops in (
+        (IType, ITYPE_OPS),
+        (RType, RTYPE_OPS),
+        (UType, UTYPE_OPS),
+        (JType, JTYPE_OPS),
+        (SType, STYPE_OPS),
+        (BType, BTYPE_OPS),
+    )
+    for op in ops
+}
+"""Maps an operation to the frame type and instruction class used to build it"""
+
+OPCODES = frozenset(
+    (
+        0b0000011,  # loads
+        0b0100011,  # stores
+        0b0010011,  # immediate arithmetic
+        0b0110011,  # register arithmetic
+        0b1100011,  # branches
+        0b1100111,  # jalr
+        0b1101111,  # jal
+        0b0110111,  # lui
+        0b0010111,  # auipc
+        0b0001111,  # fence
+        0b1110011,  # env
+    )
+)
+"""
+Opcodes of the base instruction set, unsupported encodings of these decode to a nop
+"""
+
+_DECODE_SPECS = (
+    # opcode, funct3, funct7, frame builder, instruction class
+    # a funct of None matches any value, as the field is not part of the encoding
+    (0b0000011, 0b000, None, _i_frame, LoadByte),
+    (0b0000011, 0b001, None, _i_frame, LoadHalfword),
+    (0b0000011, 0b010, None, _i_frame, LoadWord),
+    (0b0000011, 0b100, None, _i_frame, LoadByteU),
+    (0b0000011, 0b101, None, _i_frame, LoadHalfwordU),
+    (0b0100011, 0b000, None, _s_frame, StoreByte),
+    (0b0100011, 0b001, None, _s_frame, StoreHalfword),
+    (0b0100011, 0b010, None, _s_frame, StoreWord),
+    (0b0010011, 0b000, None, _i_frame, AddImmediate),
+    (0b0010011, 0b010, None, _i_frame, SetOnLessThanImmediate),
+    (0b0010011, 0b011, None, _i_frame, SetOnLessThanImmediateU),
+    (0b0010011, 0b100, None, _i_frame, ExclusiveOrImmediate),
+    (0b0010011, 0b110, None, _i_frame, OrImmediate),
+    (0b0010011, 0b111, None, _i_frame, AndImmediate),
+    (0b0010011, 0b001, None, _i_frame, ShiftLeftLogicalImmediate),
+    (0b0010011, 0b101, 0b0000000, _shamt_frame, ShiftRightLogicalImmediate),
+    (0b0010011, 0b101, 0b0100000, _shamt_frame, ShiftRightArithmeticImmediate),
+    (0b0110011, 0b000, 0b0000000, _r_frame, Add),
+    (0b0110011, 0b000, 0b0100000, _r_frame, Sub),
+    (0b0110011, 0b001, None, _r_frame, ShiftLeftLogical),
+    (0b0110011, 0b010, None, _r_frame, SetOnLessThan),
+    (0b0110011, 0b011, None, _r_frame, SetOnLessThanU),
+    (0b0110011, 0b100, None, _r_frame, ExclusiveOr),
+    (0b0110011, 0b101, 0b0000000, _r_frame, ShiftRightLogical),
+    (0b0110011, 0b101, 0b0100000, _r_frame, ShiftRightArithmetic),
+    (0b0110011, 0b110, None, _r_frame, Or),
+    (0b0110011, 0b111, None, _r_frame, And),
+    (0b1100011, 0b000, None, _b_frame, BranchEqual),
+    (0b1100011, 0b001, None, _b_frame, BranchNotEqual),
+    (0b1100011, 0b100, None, _b_frame, BranchOnLessThan),
+    (0b1100011, 0b101, None, _b_frame, BranchOnGreaterThanEqual),
+    (0b1100011, 0b110, None, _b_frame, BranchOnLessThanU),
+    (0b1100011, 0b111, None, _b_frame, BranchOnGreaterThanEqualU),
+    (0b1100111, None, None, _i_frame, JumpAndLinkRegister),
+    (0b1101111, None, None, _j_frame, JumpAndLink),
+    (0b0110111, None, None, _u_frame, LoadUpperImmediate),
+    (0b0010111, None, None, _u_frame, AddUpperImmediateToPc),
+)
+
+DECODE_TABLE = {
+    op << 10 | funct3 << 7 | funct7: (frame_builder, instr_type)
+    for op, funct3s, funct7s, frame_builder, instr_type in _DECODE_SPECS
+    for funct3 in (range(0b1000) if funct3s is None else (funct3s,))
+    for funct7 in (range(0b1000_0000) if funct7s is None else (funct7s,))
+}
+"""
+Maps the opcode, funct3 and funct7 fields of an instruction word, packed as
+`opcode << 10 | funct3 << 7 | funct7`, to its frame builder and instruction class
+"""
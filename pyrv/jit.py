@@ -0,0 +1,205 @@
+"""
+Contains a purely numeric fetch, decode and execute kernel for RV32I code, compiled
+to native code with Numba when it is installed.
+"""
+
+import numpy
+import numpy.typing as npt
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, harts fall back to the interpreter
+    njit = None
+
+JIT_AVAILABLE = njit is not None
+
+MASK = 0xFFFF_FFFF
+SIGN = 0x8000_0000
+
+
+def step_n(
+    regs: npt.NDArray,
+    code: npt.NDArray,
+    code_base: int,
+    data: npt.NDArray,
+    data_base: int,
+    pc: int,
+    n: int,
+) -> tuple[int, int]:
+    """
+    Execute up to `n` instructions starting at `pc`, returning the new pc and the
+    number of instructions executed.
+
+    Only instruction fetches and loads from `code`, and loads/stores to `data` are
+    handled here.
+    Execution stops before any instruction that needs the rest of the system (e.g. a
+    peripheral access, a store to instruction memory, fence/ecall or an invalid
+    encoding) so that the caller can step it through the regular `Hart` machinery.
+
+    Args:
+        regs: the register file as a uint32 array, updated in place
+        code: instruction memory viewed as a uint32 array
+        code_base: byte address of the start of `code`
+        data: data memory as a uint8 array, updated in place
+        data_base: byte address of the start of `data`
+        pc: address of the first instruction to execute
+        n: maximum number of instructions to execute
+    """
+    x = regs.astype(numpy.int64)
+    code_end = code_base + code.size * 4
+    data_end = data_base + data.size
+    steps = 0
+    while steps < n:
+        if pc & 0x3 or pc < code_base or pc >= code_end:
+            break
+        w = numpy.int64(code[(pc - code_base) >> 2])
+        op = w & 0x7F
+        rd = (w >> 7) & 0x1F
+        funct3 = (w >> 12) & 0x7
+        rs1 = (w >> 15) & 0x1F
+        rs2 = (w >> 20) & 0x1F
+        funct7 = w >> 25
+        next_pc = pc + 4
+
+        if op == 0b0010011:  # immediate arithmetic
+            imm = ((w >> 20) ^ 0x800) - 0x800
+            a = x[rs1]
+            if funct3 == 0b000:
+                v = a + imm
+            elif funct3 == 0b010:
+                v = 1 if ((a ^ SIGN) - SIGN) < imm else 0
+            elif funct3 == 0b011:
+                v = 1 if a < (imm & MASK) else 0
+            elif funct3 == 0b100:
+                v = a ^ imm
+            elif funct3 == 0b110:
+                v = a | imm
+            elif funct3 == 0b111:
+                v = a & imm
+            elif funct3 == 0b001:
+                v = a << rs2
+            elif funct7 == 0b0000000:
+                v = a >> rs2
+            elif funct7 == 0b0100000:
+                v = ((a ^ SIGN) - SIGN) >> rs2
+            else:
+                break
+            x[rd] = v & MASK
+        elif op == 0b0110011:  # register arithmetic
+            a = x[rs1]
+            b = x[rs2]
+            if funct3 == 0b000 and funct7 == 0b0000000:
+                v = a + b
+            elif funct3 == 0b000 and funct7 == 0b0100000:
+                v = a - b
+            elif funct3 == 0b001:
+                v = a << (b & 0x1F)
+            elif funct3 == 0b010:
+                v = 1 if ((a ^ SIGN) - SIGN) < ((b ^ SIGN) - SIGN) else 0
+            elif funct3 == 0b011:
+                v = 1 if a < b else 0
+            elif funct3 == 0b100:
+                v = a ^ b
+            elif funct3 == 0b101 and funct7 == 0b0000000:
+                v = a >> (b & 0x1F)
+            elif funct3 == 0b101 and funct7 == 0b0100000:
+                v = ((a ^ SIGN) - SIGN) >> (b & 0x1F)
+            elif funct3 == 0b110:
+                v = a | b
+            elif funct3 == 0b111:
+                v = a & b
+            else:
+                break
+            x[rd] = v & MASK
+        elif op == 0b0000011:  # loads
+            addr = (x[rs1] + ((w >> 20) ^ 0x800) - 0x800) & MASK
+            size = 1 << (funct3 & 0x3)
+            if funct3 == 0b011 or funct3 > 0b101:
+                break
+            if addr & (size - 1):
+                break
+            if data_base <= addr and addr + size <= data_end:
+                offset = addr - data_base
+                v = numpy.int64(0)
+                for i in range(size):
+                    v |= numpy.int64(data[offset + i]) << (8 * i)
+            elif code_base <= addr and addr + size <= code_end:
+                # e.g. constants placed alongside code, aligned so within one word
+                v = numpy.int64(code[(addr - code_base) >> 2])
+                v = (v >> (8 * (addr & 0x3))) & ((1 << (8 * size)) - 1)
+            else:
+                break
+            if funct3 == 0b000:
+                v = (v ^ 0x80) - 0x80
+            elif funct3 == 0b001:
+                v = (v ^ 0x8000) - 0x8000
+            x[rd] = v & MASK
+        elif op == 0b0100011:  # stores
+            imm = (((funct7 << 5) | rd) ^ 0x800) - 0x800
+            addr = (x[rs1] + imm) & MASK
+            size = 1 << funct3
+            if funct3 > 0b010:
+                break
+            if addr & (size - 1) or addr < data_base or addr + size > data_end:
+                break
+            offset = addr - data_base
+            v = x[rs2]
+            for i in range(size):
+                data[offset + i] = (v >> (8 * i)) & 0xFF
+        elif op == 0b1100011:  # branches
+            imm = (
+                ((w >> 31) & 0x1) << 12
+                | ((w >> 7) & 0x1) << 11
+                | ((w >> 25) & 0x3F) << 5
+                | ((w >> 8) & 0xF) << 1
+            )
+            imm = (imm ^ 0x1000) - 0x1000
+            a = x[rs1]
+            b = x[rs2]
+            if funct3 == 0b000:
+                taken = a == b
+            elif funct3 == 0b001:
+                taken = a != b
+            elif funct3 == 0b100:
+                taken = ((a ^ SIGN) - SIGN) < ((b ^ SIGN) - SIGN)
+            elif funct3 == 0b101:
+                taken = ((a ^ SIGN) - SIGN) >= ((b ^ SIGN) - SIGN)
+            elif funct3 == 0b110:
+                taken = a < b
+            elif funct3 == 0b111:
+                taken = a >= b
+            else:
+                break
+            if taken:
+                next_pc = (pc + imm) & MASK
+        elif op == 0b1101111:  # jal
+            imm = (
+                ((w >> 31) & 0x1) << 20
+                | ((w >> 12) & 0xFF) << 12
+                | ((w >> 20) & 0x1) << 11
+                | ((w >> 21) & 0x3FF) << 1
+            )
+            imm = (imm ^ 0x10_0000) - 0x10_0000
+            x[rd] = (pc + 4) & MASK
+            next_pc = (pc + imm) & MASK
+        elif op == 0b1100111:  # jalr
+            next_pc = (x[rs1] + ((w >> 20) ^ 0x800) - 0x800) & 0xFFFF_FFFE
+            x[rd] = (pc + 4) & MASK
+        elif op == 0b0110111:  # lui
+            x[rd] = w & 0xFFFF_F000
+        elif op == 0b0010111:  # auipc
+            x[rd] = (pc + (w & 0xFFFF_F000)) & MASK
+        else:  # fence, env and invalid encodings
+            break
+
+        x[0] = 0  # x0 is hardwired to zero
+        pc = next_pc
+        steps += 1
+
+    for i in range(32):
+        regs[i] = x[i]
+    return pc, steps
+
+
+if njit is not None:
+    step_n = njit(cache=True)(step_n)
@@ -3,12 +3,16 @@ Contains models of different hardware blocks, including the Hart.
 """
 
 import logging
+import mmap
+import sys
 from abc import ABC, abstractmethod
-from collections.abc import Callable
-from typing import TYPE_CHECKING, NamedTuple
+from array import array
+from bisect import bisect_right
+from collections.abc import Buffer, Callable
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Literal, NamedTuple
 
 import numpy
-import numpy.typing as npt
 
 from pyrv.helpers import (
     AccessFaultException,
@@ -58,30 +62,69 @@ class RegisterFile:
         "t5": 30,
         "t6": 31,
     }
-    REVALIASES = {v: k for k, v in ALIASES.items()}
-    ALIASES |= {f"x{i}": i for i in range(32)}  # add x0, x1, ... aliases
+    REVALIASES = MappingProxyType({v: k for k, v in ALIASES.items()})
+    ALIASES = MappingProxyType(
+        ALIASES | {f"x{i}": i for i in range(32)}  # add x0, x1, ... aliases
+    )
 
     def __init__(self) -> None:
-        self._items: tuple = (Register(),) + tuple(MutableRegister() for _ in range(31))
+        self._items = array("I", bytes(4 * 32))
+        """Register values, x0 is kept at zero by every write"""
+
+        self._signed = memoryview(self._items).cast("B").cast("i")
+        """The register values reinterpreted as signed ints, for signed operations"""
 
     def __getitem__(self, key: int | str) -> Register:
-        match key:
-            case int():
-                idx = key
-            case str():
-                idx = self.ALIASES[key]
-        return self._items[idx]
+        """
+        Return a view of a register, reading and writing the register file directly.
+        x0 is returned as a read-only `Register`.
+        """
+        idx = key if type(key) is int else self.ALIASES[key]
+        return RegisterView(self._items, idx) if idx else Register()
 
     def __setitem__(self, key: int | str, value: int | Register) -> None:
-        r = self[key]
+        idx = key if type(key) is int else self.ALIASES[key]
         i_val = value if isinstance(value, int) else value.read()
-        r.write(i_val)
+        if idx:
+            self._items[idx] = i_val & Register.MASK
 
     def __len__(self) -> int:
         return len(self._items)
 
-    def __getattr__(self, attr: str) -> Register:
-        return self[attr]
+
+class RegisterView(MutableRegister):
+    """
+    A register view of one entry of a `RegisterFile`, for external introspection. The
+    register file keeps its values in a flat array so instructions can index it
+    directly.
+    """
+
+    def __init__(self, items: array, idx: int) -> None:
+        self._items = items
+        self._idx = idx
+
+    def read(self) -> int:
+        return self._items[self._idx]
+
+    def write(self, value: int) -> None:
+        self._items[self._idx] = self._masked(int(value))
+
+
+def _register_property(idx: int) -> property:
+    """Return a property reading and writing register `idx` of a `RegisterFile`"""
+
+    def fget(self: RegisterFile) -> Register:
+        return RegisterView(self._items, idx) if idx else Register()
+
+    def fset(self: RegisterFile, value: int | Register) -> None:
+        self[idx] = value
+
+    return property(fget, fset)
+
+
+# expose each register by its ABI and x<n> names, e.g. `rf.a0` or `rf.x10`
+for _alias, _idx in RegisterFile.ALIASES.items():
+    setattr(RegisterFile, _alias, _register_property(_idx))
 
 
 class Addressable(ABC):
@@ -144,13 +187,18 @@ class Memory(Peripheral):
 
     # width2dtype = {1: numpy.uint8, 2: numpy.uint16, 4: numpy.uint32}
 
-    def __init__(self, size: int, width: int = 1):
+    def __init__(
+        self, size: int, width: int = 1, backing: Literal["array", "mmap"] = "array"
+    ):
         """
         Initializes the Memory class with size and width args.
 
         Args:
             size: the size of the memory in bytes
             width: the width of the memory in byte multiples (1, 2, or 4)
+            backing: "array" to hold the contents in a bytearray, or "mmap" to use an
+            anonymous memory map, which the OS only backs with RAM for pages that are
+            touched
         """
         # if width not in self.width2dtype:
         #     raise ValueError(f"Width must be one of {list(self.width2dtype.keys())}")
@@ -158,32 +206,97 @@ class Memory(Peripheral):
         self._size = size
         """The size of the memory in bytes"""
 
-        self._contents: npt.NDArray = numpy.zeros(self._size, numpy.uint8)
+        self._contents: bytearray | mmap.mmap
         """Internal container for the memory"""
-
-    def _write_bytes(self, addr: int, data: bytes) -> None:
+        match backing:
+            case "array":
+                self._contents = bytearray(self._size)
+            case "mmap":
+                self._contents = mmap.mmap(-1, self._size)
+            case _:
+                raise ValueError(f"Unknown memory backing {backing!r}")
+
+        self._views: dict[int, tuple[memoryview, int]] = {}
+        """Word and halfword views of the memory for each aligned access width, with
+        the shift from a byte address to an index into the view. These use the host
+        byte order, so they are only set up on little-endian hosts."""
+        if sys.byteorder == "little":
+            contents = memoryview(self._contents)
+            self._views = {
+                1: (contents, 0),
+                2: (contents[: self._size & ~0x1].cast("H"), 1),
+                4: (contents[: self._size & ~0x3].cast("I"), 2),
+            }
+
+    def _write_bytes(self, addr: int, data: Buffer) -> None:
         """Write `data` bytes to memory, starting at address `addr`"""
-        self._contents[addr : addr + len(data)] = memoryview(data)
+        self._contents[addr : addr + len(data)] = data
+
+    def write_block(self, addr: int, data: Buffer) -> None:
+        """
+        Write a block of bytes to memory starting at address `addr` in a single copy,
+        e.g. to load a program image.
+
+        Args:
+            addr: start address of the block within this memory
+            data: any contiguous buffer, such as bytes or a numpy array
+        """
+        block = memoryview(data).cast("B")
+        if addr < 0 or addr + block.nbytes > self._size:
+            raise AccessFaultException(
+                f"Block of {block.nbytes} bytes at 0x{addr:x} exceeds memory size"
+            )
+        self._write_bytes(addr, block)
 
     def read(self, addr, n_bytes) -> int:
-        return int.from_bytes(
-            self._contents[addr : addr + n_bytes].tobytes(), byteorder="little"
-        )
+        if n_bytes not in self._views or addr & (n_bytes - 1):  # unaligned access
+            data = self._contents[addr : addr + n_bytes]
+            return int.from_bytes(data, byteorder="little")
+        view, shift = self._views[n_bytes]
+        return view[addr >> shift]
 
     def write(self, addr, data, n_bytes):
-        mask = bmask(n_bytes)
-        data_lsbs = data & mask
-        self._write_bytes(addr, data_lsbs.to_bytes(n_bytes, byteorder="little"))
+        data_lsbs = data & bmask(n_bytes)
+        if n_bytes not in self._views or addr & (n_bytes - 1):  # unaligned access
+            self._write_bytes(addr, data_lsbs.to_bytes(n_bytes, byteorder="little"))
+            return
+        view, shift = self._views[n_bytes]
+        view[addr >> shift] = data_lsbs
 
 
 class InstructionMemory(Memory):
     def __init__(self, size: int):
         super().__init__(size)
 
+        self.decoded: list = [None] * (size >> 2)
+        """
+        Cache of decoded instructions, indexed by word address. Entries are the bound
+        `exec` methods of the instructions, so dispatching one is a single call.
+        """
+
+        self.blocks: dict[int, list] = {}
+        """
+        Cache of decoded blocks of straight-line code, keyed by the address of their
+        first instruction. Entries are lists of bound `exec` methods.
+        """
+
+    def _write_bytes(self, addr: int, data: Buffer) -> None:
+        super()._write_bytes(addr, data)
+        # any write invalidates the decoded instructions it overlaps
+        start, end = addr >> 2, (addr + len(data) + 3) >> 2
+        self.decoded[start:end] = [None] * (end - start)
+        self.blocks.clear()
+
+    def write(self, addr, data, n_bytes):
+        super().write(addr, data, n_bytes)
+        start, end = addr >> 2, (addr + n_bytes + 3) >> 2
+        self.decoded[start:end] = [None] * (end - start)
+        self.blocks.clear()
+
 
 class DataMemory(Memory):
-    def __init__(self, size: int):
-        super().__init__(size)
+    def __init__(self, size: int, backing: Literal["array", "mmap"] = "array"):
+        super().__init__(size, backing=backing)
 
 
 class UnallocatedAddressException(Exception):
@@ -224,7 +337,7 @@ class MemoryMappedPeripheral(Peripheral):
 
     def get_register(self, addr: int) -> int | None:
         """Return the index matching this address if the register exists, else None"""
-        idx = self._register_lookup[addr >> 2]
+        idx = self._register_lookup.item(addr >> 2)
         return None if idx == 0 else idx
 
     def alloc_register(self, addr: int) -> int:
@@ -232,7 +345,7 @@ class MemoryMappedPeripheral(Peripheral):
         Find the next available location in the register values map and assign the
         address `addr` to this location in the register lookup table.
         """
-        next_idx = self._register_lookup.max() + 1
+        next_idx = int(self._register_lookup.max()) + 1
         self._register_lookup[addr >> 2] = next_idx
         return next_idx
 
@@ -352,19 +465,49 @@ class SystemBus(Addressable):
     ports (memory + peripherals) on the system address map
     """
 
+    ACCESS_WIDTHS = frozenset((1, 2, 4))
+    """Valid access widths in bytes, the powers of 2 that fit the 32-bit bus"""
+
     def __init__(self, hart: "Hart"):
         self._hart = hart
         self._slave_ports: dict[str, tuple[AddressRange, Peripheral]] = {}
+        self._port_starts: list[int] = []
+        """Start addresses of the slave ports in ascending order, for bisection"""
+        self._ports_by_start: list[tuple[AddressRange, Peripheral]] = []
+        """The slave ports in the same order as `_port_starts`"""
+        self._last_port: tuple[int, int, Peripheral | None] = (0, 0, None)
+        """
+        Start address, end address (exclusive) and peripheral of the port hit by the
+        previous access, checked first as accesses are local
+        """
         self._log = logging.getLogger(__name__)
 
     def read(self, addr, n_bytes):
-        peripheral, offset = self.get_access(addr, n_bytes)
+        access = self._fast_access(addr, n_bytes) or self.get_access(addr, n_bytes)
+        peripheral, offset = access
         return peripheral.read(offset, n_bytes)
 
     def write(self, addr, data, n_bytes):
-        peripheral, offset = self.get_access(addr, n_bytes)
+        access = self._fast_access(addr, n_bytes) or self.get_access(addr, n_bytes)
+        peripheral, offset = access
         return peripheral.write(offset, data, n_bytes)
 
+    def _fast_access(self, addr: int, n_bytes: int) -> tuple[Peripheral, int] | None:
+        """
+        Return the peripheral and offset of an aligned access within the port hit by
+        the previous access, e.g. successive loads from data memory, else None so that
+        the access takes the full checks of `get_access`
+        """
+        start, end, peripheral = self._last_port
+        if (
+            start <= addr
+            and addr + n_bytes <= end
+            and not addr & (n_bytes - 1)
+            and n_bytes in self.ACCESS_WIDTHS
+        ):
+            return peripheral, addr - start  # type: ignore
+        return None
+
     def add_slave_port(
         self, name: str, start_addr: int, size: int, peripheral: Peripheral
     ):
@@ -391,7 +534,17 @@ class SystemBus(Addressable):
                     f"overlaps with existing peripheral {existing_name}"
                 )
 
+        # a port registered again under the same name replaces the previous one
+        if (replaced := self._slave_ports.get(name)) is not None:
+            i = self._ports_by_start.index(replaced)
+            del self._port_starts[i]
+            del self._ports_by_start[i]
+            self._last_port = (0, 0, None)
+
         self._slave_ports[name] = (new_range, peripheral)
+        i = bisect_right(self._port_starts, start_addr)
+        self._port_starts.insert(i, start_addr)
+        self._ports_by_start.insert(i, (new_range, peripheral))
 
     def check_access(self, addr: int, n_bytes: int) -> ValidAccess | None:
         """
@@ -407,15 +560,17 @@ class SystemBus(Addressable):
         Returns:
             A `ValidAccess` if the access is valid, else None
         """
-        if (n_bytes & (n_bytes - 1) != 0) or n_bytes == 0:
-            raise AddressMisalignedException
-        if n_bytes > 4:
-            raise AddressMisalignedException
-        if addr % n_bytes != 0:
+        if n_bytes not in self.ACCESS_WIDTHS or addr & (n_bytes - 1):
             raise AddressMisalignedException
-        for _, (addr_range, peripheral) in self._slave_ports.items():
-            if addr_range.contains(addr, n_bytes):
-                return ValidAccess(peripheral, addr - addr_range.start)
+        # ports don't overlap, so only the last one starting at or below addr can
+        # contain it
+        i = bisect_right(self._port_starts, addr) - 1
+        if i < 0:
+            return None
+        addr_range, peripheral = self._ports_by_start[i]
+        if addr_range.contains(addr, n_bytes):
+            self._last_port = (addr_range.start, addr_range.end + 1, peripheral)
+            return ValidAccess(peripheral, addr - addr_range.start)
 
     def get_access(self, addr: int, n_bytes: int = 1) -> ValidAccess:
         """
@@ -425,7 +580,7 @@ class SystemBus(Addressable):
         The access occurs at address `addr` and has an extent of `n_bytes`. If this
         access is invalid, then no peripheral is returned.
         """
-        self._log.debug(f"Access request at {addr=} for {n_bytes=}")
+        self._log.debug("Access request at addr=%#x for n_bytes=%d", addr, n_bytes)
         valid_access = self.check_access(addr, n_bytes)
         if not valid_access:
             raise AccessFaultException(
@@ -1 +1 @@
-#define SIM_CONTROL_BASE 0xffffffef
+#define SIM_CONTROL_BASE 0xfffffff0
@@ -66,3 +66,63 @@ def get_section_bytes(build_dir: Path, testcase: str, section: str) -> list[int]
         raise RuntimeError(f"object copy failed:\n{result.stderr}\n{result.args}")
     with open(out_path, "rb") as binfile:
         return list(binfile.read())
+
+
+def encode_i(op: int, funct3: int, rd: int, rs1: int, imm: int) -> int:
+    """Encode an I-type instruction word"""
+    return (imm & 0xFFF) << 20 | rs1 << 15 | funct3 << 12 | rd << 7 | op
+
+
+def encode_r(funct7: int, funct3: int, rd: int, rs1: int, rs2: int) -> int:
+    """Encode an R-type register arithmetic instruction word"""
+    return funct7 << 25 | rs2 << 20 | rs1 << 15 | funct3 << 12 | rd << 7 | 0b0110011
+
+
+def encode_s(funct3: int, rs1: int, rs2: int, imm: int) -> int:
+    """Encode an S-type store instruction word"""
+    return (
+        (imm >> 5 & 0x7F) << 25
+        | rs2 << 20
+        | rs1 << 15
+        | funct3 << 12
+        | (imm & 0x1F) << 7
+        | 0b0100011
+    )
+
+
+def encode_b(funct3: int, rs1: int, rs2: int, imm: int) -> int:
+    """Encode a B-type branch instruction word"""
+    return (
+        (imm >> 12 & 0x1) << 31
+        | (imm >> 5 & 0x3F) << 25
+        | rs2 << 20
+        | rs1 << 15
+        | funct3 << 12
+        | (imm >> 1 & 0xF) << 8
+        | (imm >> 11 & 0x1) << 7
+        | 0b1100011
+    )
+
+
+def encode_u(op: int, rd: int, imm: int) -> int:
+    """Encode a U-type instruction word, `imm` holds the upper 20 bits in place"""
+    return (imm & 0xFFFFF000) | rd << 7 | op
+
+
+def encode_j(rd: int, imm: int) -> int:
+    """Encode a jal instruction word"""
+    return (
+        (imm >> 20 & 0x1) << 31
+        | (imm >> 1 & 0x3FF) << 21
+        | (imm >> 11 & 0x1) << 20
+        | (imm >> 12 & 0xFF) << 12
+        | rd << 7
+        | 0b1101111
+    )
+
+
+def load_words(hart, words: list[int]):
+    """Write instruction words to the start of instruction memory and pre-decode them"""
+    data = b"".join(w.to_bytes(4, "little") for w in words)
+    hart.instruction_memory.write_block(0, data)
+    hart.predecode(0, len(data))
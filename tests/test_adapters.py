@@ -0,0 +1,50 @@
+"""Tests the assembly and ELF adapters"""
+
+import pytest
+
+from pyrv.adapters import asm2instr, parse_asm
+from pyrv.helpers import InvalidInstructionError
+from pyrv.instructions import AddImmediate, StoreWord
+from tests.helpers import get_rel_file
+
+
+def test_parse_asm():
+    text = get_rel_file("add.s").read_text()
+    instrs = parse_asm(text)
+    assert len(instrs) == 7
+    assert instrs[0] == ("addi", ["t0", "x0", "10"])
+    assert instrs[-1] == ("sra", ["t6", "t1", "t0"])
+
+
+def test_parse_asm_comments_and_labels():
+    text = get_rel_file("controlflow.s").read_text()
+    assert parse_asm(text) == [
+        ("li", ["x1", "5"]),
+        ("addi", ["x1", "x1", "-1"]),
+        ("bnez", ["x1", "loop"]),
+    ]
+
+    # labels on the same line as an instruction
+    text = "loop: addi a0, a0, 1\n1: end: bne a0, a1, loop # back\nexit:\n"
+    assert parse_asm(text) == [
+        ("addi", ["a0", "a0", "1"]),
+        ("bne", ["a0", "a1", "loop"]),
+    ]
+
+
+def test_asm2instr():
+    instr = asm2instr(("addi", [1, 2, 42]))
+    assert instr == AddImmediate({"rd": 1, "rs1": 2, "imm": 42})
+    instr = asm2instr(("sw", [1, 2, 8]))
+    assert instr == StoreWord({"rs1": 1, "rs2": 2, "imm": 8})
+
+    with pytest.raises(InvalidInstructionError):
+        asm2instr(("bnez", [1, 2]))
+
+    # operands missing or left over
+    with pytest.raises(InvalidInstructionError):
+        asm2instr(("addi", ["a0", "a1"]))
+    with pytest.raises(InvalidInstructionError):
+        asm2instr(("jal", ["ra"]))
+    with pytest.raises(InvalidInstructionError):
+        asm2instr(("add", ["a0", "a1", "a2", "a3"]))
@@ -2,7 +2,18 @@ import pytest
 from elftools.elf.elffile import ELFFile
 
 from pyrv.harts import Hart
-from tests.helpers import compile_sourcefile, get_section_bytes
+from pyrv.helpers import AccessFaultException, AddressMisalignedException
+from pyrv.instructions import AddImmediate
+from pyrv.jit import step_n
+from pyrv.models import DataMemory
+from tests.helpers import (
+    compile_sourcefile,
+    encode_i,
+    encode_j,
+    get_section_bytes,
+    load_words,
+)
+from tests.testcases.program import DATA_BASE, SUM_LOOP
 
 
 @pytest.fixture
@@ -33,3 +44,151 @@ def test_load(build_dir, hart: Hart):
             | text_data[i]
         )
         assert hart.read(addr, 4) == word
+
+
+def test_predecode(hart: Hart):
+    """Decoded instructions are cached and invalidated by writes to memory"""
+    addi = 0x00500093  # addi x1, x0, 5
+    hart.instruction_memory._write_bytes(0, addi.to_bytes(4, "little"))
+    hart.predecode(0, 4)
+    assert hart.instruction_memory.decoded[0].__self__ == AddImmediate(
+        {"rd": 1, "rs1": 0, "imm": 5}
+    )
+    hart.step()
+    assert hart.rf[1] == 5
+
+    hart.write(Hart.INSTRUCTION_MEMORY_BASE, 0x00700093, 4)  # addi x1, x0, 7
+    assert hart.instruction_memory.decoded[0] is None
+    hart.pc.write(0)
+    hart.step()
+    assert hart.rf[1] == 7
+
+
+def test_decode_cache(hart: Hart):
+    """Repeated instruction words share one decoded instruction"""
+    addi = 0x00100093  # addi x1, x0, 1
+    load_words(hart, [addi, 0x00000013, addi])  # addi, nop, addi
+    decoded = hart.instruction_memory.decoded
+    assert decoded[0] is decoded[2]
+    assert decoded[0] is not decoded[1]
+    assert len(hart._decode_cache) == 2
+
+
+def test_blocks():
+    """Blocks run up to control flow or a store, and are dropped on code writes"""
+    hart = Hart(jit=False)
+    load_words(hart, SUM_LOOP)
+    assert hart.run(max_steps=8) == 8
+    blocks = hart.instruction_memory.blocks
+    assert [len(blocks[pc]) for pc in sorted(blocks)] == [5, 3]
+    assert blocks[0][-1].__self__ == hart.instruction_memory.decoded[4].__self__
+
+    hart.write(Hart.INSTRUCTION_MEMORY_BASE + 8, 0x00000013, 4)  # nop
+    assert not blocks
+
+
+def test_bus_routing(hart: Hart):
+    """Accesses alternating between ports reach the right peripheral"""
+    hart.write(DATA_BASE, 0x1234, 4)
+    hart.write(Hart.INSTRUCTION_MEMORY_BASE, 0x5678, 4)
+    assert hart.read(DATA_BASE, 4) == 0x1234
+    assert hart.read(Hart.INSTRUCTION_MEMORY_BASE, 4) == 0x5678
+    assert hart.data_memory.read(0, 4) == 0x1234
+    assert hart.instruction_memory.read(0, 4) == 0x5678
+
+    # between the data memory and simulation control ports
+    with pytest.raises(AccessFaultException):
+        hart.read(Hart.DATA_MEMORY_BASE + Hart.DATA_MEMORY_SIZE, 4)
+    data_end = Hart.DATA_MEMORY_BASE + Hart.DATA_MEMORY_SIZE
+    hart.write(data_end - 4, 0x9ABC, 4)
+    assert hart.read(data_end - 4, 4) == 0x9ABC
+    with pytest.raises(AccessFaultException):
+        hart.write(data_end, 0, 4)
+
+
+def test_bus_replace_port(hart: Hart):
+    """A port added again under the same name no longer serves its old range"""
+    old_base = Hart.DATA_MEMORY_BASE
+    new_base = old_base + Hart.DATA_MEMORY_SIZE
+    hart.read(old_base, 4)  # cache the port about to be replaced
+    hart.system_bus.add_slave_port("data memory", new_base, 0x1000, DataMemory(0x1000))
+    hart.write(new_base, 0x1234, 4)
+    assert hart.read(new_base, 4) == 0x1234
+    with pytest.raises(AccessFaultException):
+        hart.write(old_base, 0, 4)
+
+
+@pytest.mark.parametrize("offset,n_bytes", [(1, 4), (2, 4), (1, 2), (0, 3), (0, 8)])
+def test_bus_misaligned(hart: Hart, offset: int, n_bytes: int):
+    hart.read(DATA_BASE, 4)  # the same port as the previous access
+    with pytest.raises(AddressMisalignedException):
+        hart.read(DATA_BASE + offset, n_bytes)
+    with pytest.raises(AddressMisalignedException):
+        hart.write(DATA_BASE + offset, 0, n_bytes)
+
+
+def test_run():
+    hart = Hart(jit=False)
+    load_words(hart, SUM_LOOP)
+    assert hart.run(max_steps=100) == 100
+    assert hart.rf["sp"] == 55
+    assert hart.rf["tp"] == 55
+    assert hart.rf["t0"] == 0xFFFFFFFD
+    assert hart.rf["t1"] == 0xFFFFFFFF
+    assert hart.rf["t2"] == 1
+    assert hart.rf["ra"] == 12 * 4
+    assert hart.rf["s0"] == 0
+    assert hart.pc == 13 * 4
+    assert hart.read(DATA_BASE + 4, 4) == 55
+
+
+def test_jit_kernel_matches_interpreter():
+    interpreted = Hart(jit=False)
+    load_words(interpreted, SUM_LOOP)
+    interpreted.run(max_steps=100)
+
+    hart = Hart()
+    load_words(hart, SUM_LOOP)
+    pc, n = step_n(
+        hart._jit_regs,
+        hart._jit_code,
+        Hart.INSTRUCTION_MEMORY_BASE,
+        hart._jit_data,
+        Hart.DATA_MEMORY_BASE,
+        0,
+        100,
+    )
+    assert (pc, n) == (interpreted.pc.read(), 100)
+    assert list(hart.rf._items) == list(interpreted.rf._items)
+    assert hart.read(DATA_BASE + 4, 4) == 55
+
+
+def test_jit_kernel_loads_from_code():
+    """The kernel loads constants stored in instruction memory like the interpreter"""
+    program = [
+        encode_i(0b0000011, 0b010, 1, 0, 16),  # lw ra, 16(zero)
+        encode_i(0b0000011, 0b001, 2, 0, 18),  # lh sp, 18(zero)
+        encode_i(0b0000011, 0b100, 3, 0, 17),  # lbu gp, 17(zero)
+        encode_j(0, 0),  # j .
+        0x8765_4321,  # .word
+    ]
+    interpreted = Hart(jit=False)
+    load_words(interpreted, program)
+    interpreted.run(max_steps=3)
+
+    hart = Hart()
+    load_words(hart, program)
+    args = (Hart.INSTRUCTION_MEMORY_BASE, hart._jit_data, Hart.DATA_MEMORY_BASE)
+    pc, n = step_n(hart._jit_regs, hart._jit_code, *args, 0, 3)
+    assert (pc, n) == (12, 3)
+    assert list(hart.rf._items) == list(interpreted.rf._items)
+    assert hart.rf["ra"] == 0x8765_4321
+    assert hart.rf["sp"] == 0xFFFF_8765
+    assert hart.rf["gp"] == 0x43
+
+
+def test_run_until_exit(hart: Hart):
+    load_words(hart, [encode_j(0, 0)])
+    hart.write(Hart.SIM_CONTROL_BASE, 0x1, 4)
+    assert hart.halted
+    assert hart.run() == 0
@@ -6,7 +6,19 @@ import pytest
 
 from pyrv.harts import Hart
 from pyrv.helpers import Register
-from pyrv.instructions import ITYPE_OPS, OP2INSTR, RTYPE_OPS, Instruction, IType, RType
+from pyrv.instructions import (
+    ITYPE_OPS,
+    OP2INSTR,
+    RTYPE_OPS,
+    Instruction,
+    IType,
+    LoadByte,
+    LoadHalfwordU,
+    LoadWord,
+    RType,
+    StoreByte,
+    StoreWord,
+)
 from tests.testcases.itype import ITYPE_TESTCASES, TestCaseIType
 from tests.testcases.rtype import RTYPE_TESTCASES, TestCaseRType
 
@@ -28,6 +40,31 @@ def test_register_bank_aliases(hart: Hart):
     assert hart.rf["t0"] == 0xF
     assert hart.rf[5] == 0xF
 
+    with pytest.raises(AttributeError):
+        _ = hart.rf.t7  # not a register name
+
+
+def test_register_views(hart: Hart):
+    """Registers returned by the register file write through to it"""
+    hart.rf[5].write(9)
+    assert hart.rf.t0 == 9
+    hart.rf.a0.write(0x1_0000_0001)
+    assert hart.rf[10] == 1
+
+    # x0 is read-only
+    assert type(hart.rf[0]) is Register
+    hart.rf.zero.write(3)
+    assert hart.rf[0] == 0
+
+
+@pytest.mark.parametrize("instr", OP2INSTR.values())
+def test_instruction_slots(instr: type[Instruction]):
+    """Operands are held in slots, instructions carry no per-instance dict"""
+    i = instr({"rd": 1, "rs1": 2, "rs2": 3, "imm": 4})
+    assert not hasattr(i, "__dict__")
+    with pytest.raises(AttributeError):
+        i.foo = 1  # type: ignore
+
 
 @pytest.mark.parametrize(
     "instr,tc", [(OP2INSTR[op], tc) for op in ITYPE_OPS for tc in ITYPE_TESTCASES[op]]
@@ -52,3 +89,21 @@ def test_rtype(instr: type[Instruction[RType]], tc: TestCaseRType, hart: Hart):
     instr(tc.frame).exec(hart)
     # verify
     assert hart.rf[tc.frame["rd"]] == tc.expected_rd
+
+
+def test_load_store(hart: Hart):
+    hart.rf[2] = Hart.DATA_MEMORY_BASE
+    hart.rf[3] = 0xDEADBEEF
+    StoreWord({"rs1": 2, "rs2": 3, "imm": 8}).exec(hart)
+    assert hart.read(Hart.DATA_MEMORY_BASE + 8, 4) == 0xDEADBEEF
+
+    LoadWord({"rd": 1, "rs1": 2, "imm": 8}).exec(hart)
+    assert hart.rf[1] == 0xDEADBEEF
+    LoadByte({"rd": 1, "rs1": 2, "imm": 8}).exec(hart)
+    assert hart.rf[1] == 0xFFFFFFEF
+    LoadHalfwordU({"rd": 1, "rs1": 2, "imm": 10}).exec(hart)
+    assert hart.rf[1] == 0xDEAD
+
+    StoreByte({"rs1": 2, "rs2": 3, "imm": 12}).exec(hart)
+    assert hart.read(Hart.DATA_MEMORY_BASE + 12, 4) == 0xEF
+    assert hart.pc == 5 * 4  # every load and store advances the pc
@@ -2,10 +2,11 @@
 
 from random import randint
 
+import numpy
 import pytest
 
-from pyrv.helpers import bmask
-from pyrv.models import Memory
+from pyrv.helpers import AccessFaultException, bmask
+from pyrv.models import DataMemory, Memory
 
 
 @pytest.fixture
@@ -22,3 +23,24 @@ def test_memory_smoke(size: int, n: int):
     to_write = randint(0, lim)
     m.write(8, to_write, n)
     assert m.read(8, to_write & lim)
+
+
+def test_write_block(mem: Memory):
+    mem.write_block(4, b"\x01\x02")
+    mem.write_block(8, numpy.array([0xAABBCCDD, 0x11223344], numpy.uint32))
+    assert mem.read(4, 2) == 0x0201
+    assert mem.read(8, 4) == 0xAABBCCDD
+    assert mem.read(12, 4) == 0x11223344
+
+    with pytest.raises(AccessFaultException):
+        mem.write_block(12, bytes(8))
+
+
+def test_mmap_backing():
+    m = DataMemory(64 * 1024, backing="mmap")
+    assert m.read(0x100, 4) == 0
+    m.write(0x100, 0xAABBCCDD, 4)
+    m.write(0x103, 0x11, 1)
+    m.write_block(0x200, b"\x01\x02\x03")
+    assert m.read(0x100, 4) == 0x11BBCCDD
+    assert m.read(0x202, 1) == 0x03
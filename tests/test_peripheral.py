@@ -71,3 +71,10 @@ def test_triggers(peri: MemoryMappedPeripheral):
     peri.add_trigger(0x0, lambda new, old: new == 0xAABB, set_flag)
     peri.write(0x0, 0xAABB, 4)
     assert flag
+
+
+def test_python_ints(peri: MemoryMappedPeripheral):
+    """Register indices and values come back as Python ints, not numpy scalars"""
+    peri.set_register(8, 0x1234)
+    assert type(peri.get_register(8)) is int
+    assert type(peri.read(8, 4)) is int
@@ -73,6 +73,15 @@ def test_sign_extend(value: int, bits: int, expected: int):
     assert pyrv.helpers.se(value, bits) == expected
 
 
+@pytest.mark.parametrize("bits", [12, 13, 21])
+@pytest.mark.parametrize("sign", [0, 1])
+def test_sign_extend_specialised(bits: int, sign: int):
+    se_n = getattr(pyrv.helpers, f"se{bits}")
+    for value in (0x0, 0x1, (1 << bits - 1) - 1):
+        value |= sign << bits - 1
+        assert se_n(value) == pyrv.helpers.se(value, bits)
+
+
 def test_arithmetic_operations(reg: MutableRegister):
     """Test sub and add with both ints and `MutableRegister`s"""
 
@@ -0,0 +1,30 @@
+"""Small hand-assembled programs for exercising the instruction loop"""
+
+from tests.helpers import (
+    encode_b,
+    encode_i,
+    encode_j,
+    encode_r,
+    encode_s,
+    encode_u,
+)
+
+DATA_BASE = 0x0020_0000
+
+SUM_LOOP = [
+    encode_i(0b0010011, 0b000, 1, 0, 10),  # addi ra, zero, 10
+    encode_i(0b0010011, 0b000, 2, 0, 0),  # addi sp, zero, 0
+    encode_r(0b0000000, 0b000, 2, 2, 1),  # loop: add sp, sp, ra
+    encode_i(0b0010011, 0b000, 1, 1, -1),  # addi ra, ra, -1
+    encode_b(0b001, 1, 0, -8),  # bne ra, zero, loop
+    encode_u(0b0110111, 3, DATA_BASE),  # lui gp, %hi(DATA_BASE)
+    encode_s(0b010, 3, 2, 4),  # sw sp, 4(gp)
+    encode_i(0b0000011, 0b000, 4, 3, 4),  # lb tp, 4(gp)
+    encode_i(0b0010011, 0b000, 5, 0, -3),  # addi t0, zero, -3
+    encode_i(0b0010011, 0b101, 6, 5, 0b0100000_00010),  # srai t1, t0, 2
+    encode_r(0b0000000, 0b010, 7, 5, 2),  # slt t2, t0, sp
+    encode_j(1, 8),  # jal ra, end
+    encode_i(0b0010011, 0b000, 8, 0, 1),  # addi s0, zero, 1 (skipped)
+    encode_j(0, 0),  # end: j end
+]
+"""Sums 10..1 into sp, stores and reloads it, then spins at the end"""